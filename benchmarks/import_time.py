@@ -0,0 +1,72 @@
+"""
+Measures the import time of content_plugins modules.
+
+Every run imports the modules in a fresh interpreter after django.setup()
+and reports the median wall time and the third-party modules pulled in.
+To compare before and after a change, run it against two checkouts:
+
+    git worktree add /tmp/content-plugins-before <revision>
+    python benchmarks/import_time.py --path /tmp/content-plugins-before
+    python benchmarks/import_time.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = [
+    'content_plugins',
+    'content_plugins.admin',
+    'content_plugins.base',
+    'content_plugins.renderer',
+]
+
+CHILD = """
+import json, sys, time
+import django
+from django.conf import settings
+settings.configure(
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth'],
+    CKEDITOR_UPLOADS=True,
+)
+django.setup()
+before = set(sys.modules)
+started = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+duration = time.perf_counter() - started
+imported = sorted(set(m.partition('.')[0] for m in set(sys.modules) - before))
+print(json.dumps({{'duration': duration, 'imported': imported}}))
+"""
+
+
+def run_once(path, modules):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [path] + [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]))
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD.format(modules=modules)], env=env, cwd=path)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--path', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        help="Checkout of django-content-plugins to measure.")
+    parser.add_argument('--modules', nargs='+', default=DEFAULT_MODULES)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    results = [run_once(args.path, args.modules) for i in range(args.runs)]
+    durations = [r['duration'] for r in results]
+    print("{}: median {:.1f} ms, min {:.1f} ms ({} runs)".format(
+        args.path, statistics.median(durations) * 1000, min(durations) * 1000, args.runs))
+    print("Imported packages: {}".format(", ".join(results[-1]['imported'])))
+
+
+if __name__ == '__main__':
+    main()
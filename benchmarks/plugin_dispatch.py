@@ -0,0 +1,87 @@
+"""
+Micro-benchmark for the per-plugin dispatch overhead of the renderers.
+
+Renders a "page" with thousands of plugins of a few dozen types with
+string renderers returning an empty string, so that only the renderer
+lookup is measured.
+
+Usage:
+    python benchmarks/plugin_dispatch.py [--plugins 5000] [--types 25]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+django.setup()
+
+from content_editor.renderer import PluginRenderer as ContentEditorPluginRenderer  # noqa: E402
+from feincms3.renderer import TemplatePluginRenderer  # noqa: E402
+
+from content_plugins.renderer import ContentPluginRenderer, PluginRenderer  # noqa: E402
+
+
+def render(plugin, **kwargs):
+    return ''
+
+
+def make_plugin_classes(count):
+    return [type('Plugin{}'.format(i), (object,), {'render': render}) for i in range(count)]
+
+
+def report(name, seconds, count):
+    print("{:<45} {:8.1f} ns".format(name, seconds / count * 1e9))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--plugins', type=int, default=5000)
+    parser.add_argument('--types', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    classes = make_plugin_classes(args.types)
+    contents = [classes[i % len(classes)]() for i in range(args.plugins)]
+    total = args.plugins * args.repeat
+
+    def best(fn):
+        return min(timeit.repeat(fn, number=1, repeat=args.repeat)) * args.repeat
+
+    # content_editor.renderer.PluginRenderer, as used by PluginRenderer before
+    content_editor = ContentEditorPluginRenderer()
+    for cls in classes:
+        content_editor.register(cls, render)
+    report("content_editor PluginRenderer", best(
+        lambda: [content_editor.render_content(c) for c in contents]), total)
+
+    experimental = PluginRenderer()
+    for cls in classes:
+        experimental.register(cls)
+    experimental.freeze()
+    report("PluginRenderer (frozen dispatch table)", best(
+        lambda: [experimental.render_content(c) for c in contents]), total)
+
+    for name, renderer_class in (
+            ("feincms3 TemplatePluginRenderer", TemplatePluginRenderer),
+            ("ContentPluginRenderer (frozen)", ContentPluginRenderer)):
+        renderer = renderer_class()
+        for cls in classes:
+            renderer.register_string_renderer(cls, render)
+        if hasattr(renderer, 'freeze'):
+            renderer.freeze()
+        report(name, best(
+            lambda: [renderer.render_plugin_in_context(c) for c in contents]), total)
+        # plugins() is called for every regions() call
+        report("  plugins(), {} types (per call)".format(args.types), min(timeit.repeat(
+            renderer.plugins, number=10000, repeat=args.repeat)), 10000)
+
+
+if __name__ == '__main__':
+    main()
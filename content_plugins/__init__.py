@@ -1,6 +1,3 @@
-from django.conf import settings
-
-
 try:
     from ._version import __version__
 except ImportError:
@@ -10,10 +7,20 @@ VERSION = __version__.partition('+')
 VERSION = tuple(list(map(int, VERSION[0].split('.'))) + [VERSION[2]])
 
 
-USE_TRANSLATABLE_FIELDS = (
-    getattr(settings, 'CONTENT_PLUGINS_USE_TRANSLATABLE_FIELDS', False) or
-    getattr(settings, 'USE_TRANSLATABLE_FIELDS', False)
-)
+def use_translatable_fields():
+    from django.conf import settings
+    return (
+        getattr(settings, 'CONTENT_PLUGINS_USE_TRANSLATABLE_FIELDS', False) or
+        getattr(settings, 'USE_TRANSLATABLE_FIELDS', False)
+    )
+
+
+def __getattr__(name):
+    # Settings are read on first access, not when the app is loaded
+    if name == 'USE_TRANSLATABLE_FIELDS':
+        value = globals()[name] = use_translatable_fields()
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 # TODO Implement translatable AutoSlugField: USE_TRANSLATABLE_SLUG_FIELDS = getattr(settings, 'CONTENT_USE_TRANSLATABLE_SLUG_FIELDS', True)
@@ -2,6 +2,8 @@
 Abstract base classes and mixins.
 """
 
+from functools import lru_cache
+
 from django import forms
 from django.conf import settings
 
@@ -22,28 +24,49 @@ class ContentInlineBase(ContentEditorInline):
 
 # TODO Use feincms3.plugins.richtext.RichText/RichTextInline instead
 
-if getattr(settings, 'CKEDITOR_UPLOADS', False):
-    from ckeditor_uploader.widgets import CKEditorUploadingWidget
-    base_classes = [CKEditorUploadingWidget]
-else:
-    base_classes = [forms.Textarea]
+@lru_cache()
+def get_richtext_widget_class():
+    """
+    Builds RichTextarea on first use, ckeditor_uploader is only
+    imported if settings.CKEDITOR_UPLOADS is set.
+    """
+    if getattr(settings, 'CKEDITOR_UPLOADS', False):
+        from ckeditor_uploader.widgets import CKEditorUploadingWidget
+        base_classes = [CKEditorUploadingWidget]
+    else:
+        base_classes = [forms.Textarea]
+
+    class RichTextarea(*base_classes):
+        def __init__(self, attrs=None):
+            # Provide class so that the code in plugin_ckeditor.js knows
+            # which text areas should be enhanced with a rich text
+            # control:
+            default_attrs = {'class': 'richtext'}
+            if attrs:
+                default_attrs.update(attrs)
+            super().__init__(default_attrs)
+
+    return RichTextarea
 
 
-class RichTextarea(*base_classes):
-    def __init__(self, attrs=None):
-        # Provide class so that the code in plugin_ckeditor.js knows
-        # which text areas should be enhanced with a rich text
-        # control:
-        default_attrs = {'class': 'richtext'}
-        if attrs:
-            default_attrs.update(attrs)
-        super().__init__(default_attrs)
+def __getattr__(name):
+    if name == 'RichTextarea':
+        return get_richtext_widget_class()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+class RichTextFormfieldOverrides:
+    """
+    Resolves the widget when the admin is instantiated.
+    """
+    def __get__(self, instance, owner):
+        return {
+            'richtext': {'widget': get_richtext_widget_class()},
+        }
 
 
 class RichTextInlineBase(ContentInlineBase):
-    formfield_overrides = {
-        'richtext': {'widget': RichTextarea},
-    }
+    formfield_overrides = RichTextFormfieldOverrides()
 
     class Media:
         js = (
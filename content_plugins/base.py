@@ -4,7 +4,7 @@ import re
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.db import models
-from django.utils.html import mark_safe, strip_tags
+from django.utils.html import escape, mark_safe, strip_tags
 from django.utils.text import Truncator
 from django.utils.translation import ugettext_lazy as _
 
@@ -13,11 +13,12 @@ from shared.utils.models.slugs import DowngradingSlugField
 # TODO Rename ContentInlineBase to PluginInlineBase
 from .admin import ContentInlineBase, RichTextInlineBase
 from .plugins.mixins import StyleMixin  # Make available for import
+from .plugins.renditions import RenditionMixin
 
-from . import USE_TRANSLATABLE_FIELDS
+from . import use_translatable_fields
 
 
-if USE_TRANSLATABLE_FIELDS:
+if use_translatable_fields():
     from shared.multilingual.utils.fields import TranslatableCharField
     from .fields import TranslatableCleansedRichTextField
 else:
@@ -26,9 +27,42 @@ else:
     TranslatableCleansedRichTextField = CleansedRichTextField
 
 
+def expand_render_fields(model, field_names):
+    """
+    Returns the concrete field names for field_names, translatable
+    fields are expanded to their per-language columns.
+    """
+    concrete = [f.name for f in model._meta.concrete_fields]
+    language_codes = [code.replace('-', '_') for code, name in settings.LANGUAGES]
+    expanded = []
+    for name in field_names:
+        if name in concrete:
+            expanded.append(name)
+            continue
+        translated = [
+            "{}_{}".format(name, code) for code in language_codes
+            if "{}_{}".format(name, code) in concrete
+        ]
+        if not translated:
+            raise ImproperlyConfigured(
+                "{}: render field '{}' does not exist.".format(model._meta.label, name))
+        expanded += translated
+    return expanded
+
+
 class BasePlugin(models.Model):
     admin_inline_baseclass = ContentInlineBase
 
+    # Names of the fields used by the plugin's renderer and templates.
+    # If set, only these fields are loaded for rendering, other fields
+    # are deferred. None loads all fields. Opt-in: the base classes don't
+    # declare any, as subclasses often add fields used in their templates.
+    # render_fields of all classes in the MRO are combined.
+    render_fields = None
+    # Fields always loaded if render_fields is set, for use by mixins
+    # (e.g. StyleMixin), also combined across the MRO.
+    required_render_fields = ()
+
     class Meta:
         abstract = True
         verbose_name = _("plugin")
@@ -41,6 +75,42 @@ class BasePlugin(models.Model):
     def __str__(self):
         return "{} ({})".format(self._meta.verbose_name, self.pk)
 
+    @classmethod
+    def get_render_fields(cls):
+        if cls.render_fields is None:
+            return None
+        render_fields = []
+        for klass in cls.__mro__:
+            for attr in ('render_fields', 'required_render_fields'):
+                for name in klass.__dict__.get(attr) or ():
+                    if name not in render_fields:
+                        render_fields.append(name)
+        return render_fields
+
+    @classmethod
+    def get_render_only_fields(cls):
+        """
+        Concrete field names passed to only(), computed once per class.
+        """
+        if '_render_only_fields' not in cls.__dict__:
+            render_fields = cls.get_render_fields()
+            if render_fields is not None:
+                render_fields = expand_render_fields(
+                    cls, ['parent', 'region', 'ordering'] + render_fields)
+            cls._render_only_fields = render_fields
+        return cls._render_only_fields
+
+    @classmethod
+    def get_render_queryset(cls):
+        """
+        Queryset used by the renderer to load the plugins.
+        """
+        queryset = cls.get_queryset()
+        only_fields = cls.get_render_only_fields()
+        if only_fields is not None:
+            queryset = queryset.only(*only_fields)
+        return queryset
+
     @classmethod
     def admin_inline(cls, base_class=None):
         class Inline(base_class or cls.admin_inline_baseclass):
@@ -192,6 +262,13 @@ class ObjectPluginBase(FilesystemTemplateRendererPlugin):
     def __str__(self):
         return str(getattr(self, self.fk_fieldname, ""))
 
+    @classmethod
+    def get_render_fields(cls):
+        render_fields = super().get_render_fields()
+        if render_fields is not None and cls.fk_fieldname not in render_fields:
+            render_fields.append(cls.fk_fieldname)
+        return render_fields
+
     @property
     def object(self):
         assert self.fk_fieldname, "fk_fieldname not set."
@@ -241,7 +318,7 @@ class ObjectPluginBase(FilesystemTemplateRendererPlugin):
         return inline
 
 
-class SimpleImageBase(StringRendererPlugin):
+class SimpleImageBase(RenditionMixin, StringRendererPlugin):
     image = models.ImageField(_("image"), upload_to='images/%Y/%m/')
     caption = TranslatableCharField(_("caption"), max_length=500,
         null=True, blank=True,
@@ -258,7 +335,7 @@ class SimpleImageBase(StringRendererPlugin):
     def render(self):
         template = """
         <figure class="image">
-            <img src="{src}">
+            <img src="{src}"{srcset}>
 
             <figcaption>
                 {caption_text}
@@ -266,8 +343,11 @@ class SimpleImageBase(StringRendererPlugin):
         </figure>
         """
 
+        srcset = self.srcset
         return mark_safe(template.format(
             src=self.image.url,
+            srcset=' srcset="{}" sizes="{}"'.format(
+                escape(srcset), escape(self.sizes)) if srcset else "",
             caption_text=mark_safe(self.caption or "")
         ))
 
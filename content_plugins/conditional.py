@@ -0,0 +1,196 @@
+"""
+Cheap ETag and Last-Modified values for content items.
+
+Every item has a version (a timestamp) in the cache which is bumped
+whenever the item or one of its tracked plugins is saved or deleted.
+Computing the validators only needs a cache lookup, no plugin is loaded
+or rendered. Tracking is opt-in, call track_renderer() once all plugins
+are registered (e.g. in AppConfig.ready()).
+
+Requires a cache shared by all processes (memcached, redis, database).
+With a per-process cache (LocMemCache) a change is only seen by the
+process which saved it and the others keep answering with 304. If the
+cache can't store the version (DummyCache), no validators are returned
+and the conditional handling is skipped.
+
+Note: Queryset update() and delete() don't send signals, call
+touch_item() yourself after using them.
+
+Changes to templates or code aren't seen by the versions. The versions
+and ETags are salted with the CONTENT_PLUGINS_ETAG_SALT setting (which
+defaults to the content_plugins version), set it to something changing
+with every deploy (e.g. the git revision) to invalidate them.
+
+Usage:
+    class PagesConfig(AppConfig):
+        def ready(self):
+            from .content_plugins import renderer
+            track_renderer(renderer)
+
+    def get_page(request, slug):
+        return get_object_or_404(Page, slug=slug)
+
+    @condition_for_item(get_page, inherit_from=lambda page: page.ancestors())
+    def page_detail(request, slug):
+        ...
+"""
+
+import hashlib
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import post_delete, post_save
+from django.utils.timezone import utc
+from django.utils.translation import get_language
+from django.views.decorators.http import condition
+
+from . import __version__
+
+
+def get_etag_salt():
+    return str(getattr(settings, 'CONTENT_PLUGINS_ETAG_SALT', __version__))
+
+
+def version_cache_key(model, pk):
+    # A new salt starts new versions, so Last-Modified moves forward too
+    return 'content-plugins-version-{}-{}-{}'.format(
+        get_etag_salt(), model._meta.label_lower, pk)
+
+
+def get_item_version(item):
+    """
+    Returns the item's version or None if the cache can't store it.
+    """
+    key = version_cache_key(item.__class__, item.pk)
+    version = cache.get(key)
+    if version is None:
+        # Unknown version (e.g. cleared cache), start a new one
+        cache.add(key, time.time(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_items_versions(items):
+    """
+    Returns the versions of items or None if any of them is unknown.
+    """
+    versions = []
+    for item in items:
+        version = get_item_version(item)
+        if version is None:
+            return None
+        versions.append(version)
+    return versions
+
+
+def touch_item(model, pk):
+    cache.set(version_cache_key(model, pk), time.time(), timeout=None)
+
+
+def item_etag(item, inherit_from=None):
+    """
+    Returns the ETag of item, depending on its version, the versions of
+    the items in inherit_from, the active language and the salt, or None.
+    """
+    items = [item] + list(inherit_from or [])
+    versions = get_items_versions(items)
+    if versions is None:
+        return None
+    version = '-'.join(
+        '{}-{}-{}'.format(i._meta.label_lower, i.pk, v) for i, v in zip(items, versions))
+    version = '{}-{}-{}'.format(version, get_language(), get_etag_salt())
+    return hashlib.md5(version.encode()).hexdigest()
+
+
+def item_last_modified(item, inherit_from=None):
+    """
+    Returns the latest change of item or the items in inherit_from, or None.
+    """
+    versions = get_items_versions([item] + list(inherit_from or []))
+    if versions is None:
+        return None
+    return datetime.fromtimestamp(max(versions), tz=utc)
+
+
+def _item_changed(sender, instance, **kwargs):
+    touch_item(sender, instance.pk)
+
+
+def _plugin_changed(sender, instance, **kwargs):
+    touch_item(sender._meta.get_field('parent').related_model, instance.parent_id)
+
+
+def connect_version_signals(plugin):
+    """
+    Bumps the version of the plugin's item when the plugin or the item
+    is saved or deleted. Only models with a parent foreign key are handled.
+    """
+    try:
+        parent = plugin._meta.get_field('parent')
+    except (AttributeError, FieldDoesNotExist):
+        return
+    if not parent.many_to_one:
+        return
+
+    uid = 'content-plugins-version-{}'.format(plugin._meta.label_lower)
+    post_save.connect(_plugin_changed, sender=plugin, weak=False, dispatch_uid=uid)
+    post_delete.connect(_plugin_changed, sender=plugin, weak=False, dispatch_uid=uid)
+
+    item_model = parent.remote_field.model
+    if isinstance(item_model, str):
+        # Not resolved yet, model signals accept a lazy "app_label.Model"
+        if item_model == 'self':
+            item_model = plugin
+        elif '.' not in item_model:
+            item_model = '{}.{}'.format(plugin._meta.app_label, item_model)
+    if isinstance(item_model, str):
+        label_lower = item_model.lower()
+    else:
+        label_lower = item_model._meta.label_lower
+    uid = 'content-plugins-version-{}'.format(label_lower)
+    post_save.connect(_item_changed, sender=item_model, weak=False, dispatch_uid=uid)
+    post_delete.connect(_item_changed, sender=item_model, weak=False, dispatch_uid=uid)
+
+
+def track_renderer(renderer):
+    """
+    Connects the version signals for all plugins registered with renderer.
+    Plugins registered afterwards aren't tracked.
+    """
+    for plugin in renderer.plugins():
+        connect_version_signals(plugin)
+
+
+def condition_for_item(get_item, inherit_from=None):
+    """
+    View decorator returning 304 responses for unchanged items.
+
+    get_item is called with the view's arguments and returns the item,
+    or None to skip the conditional handling. If the view renders
+    inherited regions, pass inherit_from, a callable receiving the item
+    and returning the items the regions inherit from (the same as passed
+    to ContentPluginRenderer.regions()), so that their changes are
+    taken into account too.
+    """
+    def _get_item(request, *args, **kwargs):
+        # Called for both validators, look the items up only once
+        if not hasattr(request, '_content_plugins_item'):
+            item = get_item(request, *args, **kwargs)
+            ancestors = []
+            if item is not None and inherit_from is not None:
+                ancestors = list(inherit_from(item))
+            request._content_plugins_item = (item, ancestors)
+        return request._content_plugins_item
+
+    def etag_func(request, *args, **kwargs):
+        item, ancestors = _get_item(request, *args, **kwargs)
+        return item_etag(item, ancestors) if item is not None else None
+
+    def last_modified_func(request, *args, **kwargs):
+        item, ancestors = _get_item(request, *args, **kwargs)
+        return item_last_modified(item, ancestors) if item is not None else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
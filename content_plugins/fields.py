@@ -1,9 +1,9 @@
 from feincms3.cleanse import CleansedRichTextField
 
-from . import USE_TRANSLATABLE_FIELDS
+from . import use_translatable_fields
 
 
-if USE_TRANSLATABLE_FIELDS:
+if use_translatable_fields():
     from shared.multilingual.utils.fields import TranslatableFieldMixin
 
     class TranslatableCleansedRichTextField(TranslatableFieldMixin, CleansedRichTextField):
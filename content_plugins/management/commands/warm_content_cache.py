@@ -0,0 +1,171 @@
+"""
+Pre-renders regions into the cache, e.g. after a deploy.
+
+The regions of items are rendered with a RequestContext of an anonymous
+GET request to the item's get_absolute_url() on --host, so context
+processors run as in the views. Plugin templates with per-request or
+per-user output (CSRF tokens, the logged in user, query parameters)
+must not be cached at all, neither by the views nor by this command.
+
+Usage:
+    # Render the regions of all pages with the given renderer
+    ./manage.py warm_content_cache --renderer=pages.content_plugins.renderer \
+        --model=pages.Page --inherit-ancestors --timeout=3600
+
+    # Request URLs (warms everything cached by the views, e.g. menus),
+    # relative URLs are requested with --host
+    ./manage.py warm_content_cache --url=/ --url=/about/ --languages de en \
+        --host=www.example.com
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from urllib.parse import urlsplit
+
+from django.apps import registry
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, RequestFactory
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders regions (or requests URLs) concurrently to warm the cache. "
+        "Regions are rendered with the context of an anonymous request, plugin "
+        "templates with per-request output must not be cached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--renderer',
+            help="Dotted path to a ContentPluginRenderer instance.")
+        parser.add_argument(
+            '--model',
+            help="Model label (app_label.ModelName) of the items to render.")
+        parser.add_argument(
+            '--pk', nargs='+', default=[],
+            help="Only render items with these primary keys.")
+        parser.add_argument(
+            '--inherit-ancestors', action='store_true',
+            help="Pass the item's ancestors as inherit_from, like the views do.")
+        parser.add_argument(
+            '--url', action='append', default=[],
+            help="URL to request, may be given multiple times.")
+        parser.add_argument(
+            '--host',
+            help="Host for relative URLs and the requests of rendered items, "
+                 "defaults to the first non-wildcard ALLOWED_HOSTS entry.")
+        parser.add_argument(
+            '--languages', nargs='+',
+            help="Language codes, defaults to all settings.LANGUAGES.")
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help="Number of concurrent workers.")
+        parser.add_argument(
+            '--timeout', type=int, default=3600,
+            help="Cache timeout of the rendered regions in seconds.")
+
+    def handle(self, *args, **options):
+        languages = options['languages'] or [code for code, name in settings.LANGUAGES]
+
+        if options['url']:
+            self.host = options['host']
+            if not self.host and any(not urlsplit(url).netloc for url in options['url']):
+                self.host = self.get_default_host()
+            jobs = [
+                (url, language, partial(self.warm_url, url, language))
+                for url in options['url'] for language in languages
+            ]
+        elif options['renderer'] and options['model']:
+            self.renderer = import_string(options['renderer'])
+            self.inherit_ancestors = options['inherit_ancestors']
+            self.host = options['host'] or self.get_default_host()
+            self.timeout = options['timeout']
+            queryset = registry.apps.get_model(options['model'])._default_manager.all()
+            if options['pk']:
+                queryset = queryset.filter(pk__in=options['pk'])
+            # All languages of an item are rendered in one pass
+            jobs = [
+                (item, ', '.join(languages), partial(self.warm_item, item, languages))
+                for item in queryset
+            ]
+        else:
+            raise CommandError("Pass either --url or --renderer and --model.")
+
+        self.run(jobs, options['workers'])
+
+    def run(self, jobs, workers):
+        started = time.monotonic()
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.timed, func): (obj, language)
+                for obj, language, func in jobs
+            }
+            for index, future in enumerate(as_completed(futures), 1):
+                obj, language = futures[future]
+                try:
+                    duration = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write("[{}/{}] {} ({}): {}".format(
+                        index, len(jobs), obj, language, e))
+                else:
+                    self.stdout.write("[{}/{}] {} ({}): {:.1f} ms".format(
+                        index, len(jobs), obj, language, duration * 1000))
+
+        self.stdout.write("Warmed {} of {} pages in {:.1f} s.".format(
+            len(jobs) - failed, len(jobs), time.monotonic() - started))
+
+    def timed(self, func):
+        started = time.monotonic()
+        try:
+            func()
+        finally:
+            # Worker threads open their own database connections
+            connections.close_all()
+        return time.monotonic() - started
+
+    def warm_item(self, item, languages):
+        inherit_from = None
+        if self.inherit_ancestors:
+            if hasattr(item, 'ancestors'):
+                inherit_from = item.ancestors()
+            else:
+                inherit_from = item.get_ancestors(ascending=True)
+        path = item.get_absolute_url() if hasattr(item, 'get_absolute_url') else '/'
+        request = RequestFactory().get(path, HTTP_HOST=self.host)
+        request.user = AnonymousUser()
+        # Stored under MultilingualRegions.cache_key of each language,
+        # so these are the keys the views read.
+        self.renderer.render_languages(
+            item, languages, inherit_from=inherit_from, timeout=self.timeout,
+            request=request)
+
+    def get_default_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and not host.startswith('.'):
+                return host
+        if settings.DEBUG or '*' in settings.ALLOWED_HOSTS:
+            # Django allows localhost with DEBUG and empty ALLOWED_HOSTS
+            return 'localhost'
+        raise CommandError("No host found in ALLOWED_HOSTS, pass --host.")
+
+    def warm_url(self, url, language):
+        parts = urlsplit(url)
+        extra = {
+            'HTTP_ACCEPT_LANGUAGE': language,
+            'HTTP_HOST': parts.netloc or self.host,
+        }
+        if parts.scheme:
+            extra['wsgi.url_scheme'] = parts.scheme
+        path = parts.path or '/'
+        if parts.query:
+            path = '{}?{}'.format(path, parts.query)
+        response = Client().get(path, **extra)
+        if response.status_code >= 400:
+            raise CommandError("Status code {}".format(response.status_code))
@@ -2,35 +2,42 @@
 Plugins for use with django-shared-mediarchive.
 """
 
+from functools import lru_cache
+
 from django.apps import registry
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-try:
-    from imagekit.admin import AdminThumbnail
-    USE_ADMIN_THUMBNAIL = True
-except ImportError:
-    USE_ADMIN_THUMBNAIL = False
-
 from ..admin import ContentInlineBase
 from ..base import ObjectPluginBase
+from .renditions import RenditionMixin
+
+
+# Model labels, the foreign keys are resolved lazily by Django
+IMAGE_MODEL = getattr(settings, 'CONTENTPLUGINS_IMAGE_MODEL', 'media_archive.Image')
+DOWNLOAD_MODEL = getattr(settings, 'CONTENTPLUGINS_DOWNLOAD_MODEL', 'media_archive.Download')
 
 
-image_model = getattr(settings, 'CONTENTPLUGINS_IMAGE_MODEL', None)
-download_model = getattr(settings, 'CONTENTPLUGINS_DOWNLOAD_MODEL', None)
+@lru_cache()
+def get_image_model():
+    return registry.apps.get_model(IMAGE_MODEL)
 
-if image_model:
-    image_model = registry.apps.get_model(image_model)
-else:
-    from shared.media_archive.models import Image
-    image_model = Image
 
-if download_model:
-    download_model = registry.apps.get_model(download_model)
-else:
-    from shared.media_archive.models import Download
-    download_model = Download
+@lru_cache()
+def get_download_model():
+    return registry.apps.get_model(DOWNLOAD_MODEL)
+
+
+def __getattr__(name):
+    # Formerly module level names, resolved on first access
+    if name == 'image_model':
+        return get_image_model()
+    if name == 'download_model':
+        return get_download_model()
+    if name == 'USE_ADMIN_THUMBNAIL':
+        return get_admin_thumbnail() is not None
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 #
@@ -40,8 +47,24 @@ def image_thumbnail(obj):
     return obj.image.thumbnail
 
 
-class ImageBase(ObjectPluginBase):
-    image = models.ForeignKey(Image, on_delete=models.CASCADE,
+@lru_cache()
+def get_admin_thumbnail():
+    """
+    Returns the imagekit AdminThumbnail or None if imagekit isn't installed.
+    """
+    try:
+        from imagekit.admin import AdminThumbnail
+    except ImportError:
+        return None
+    admin_thumbnail = AdminThumbnail(
+        image_field=image_thumbnail,
+        template='imagekit/admin/selectable_thumbnail.html')
+    admin_thumbnail.short_description = _("image")
+    return admin_thumbnail
+
+
+class ImageBase(RenditionMixin, ObjectPluginBase):
+    image = models.ForeignKey(IMAGE_MODEL, on_delete=models.CASCADE,
         verbose_name=_("image"))
 
     fk_fieldname = 'image'
@@ -54,12 +77,16 @@ class ImageBase(ObjectPluginBase):
     def get_type_slug(self):
         return ''
 
+    # The original is the file of the media archive image
+    rendition_original_field = 'file'
+
+    def get_rendition_source(self):
+        return self.image
+
     class AdminInline(ContentInlineBase):
-        if USE_ADMIN_THUMBNAIL:
-            admin_thumbnail = AdminThumbnail(
-                image_field=image_thumbnail,
-                template='imagekit/admin/selectable_thumbnail.html')
-            admin_thumbnail.short_description = _("image")
+        @property
+        def admin_thumbnail(self):
+            return get_admin_thumbnail()
 
         def get_is_public_display(self, obj):
             if not obj.image.is_public:
@@ -70,7 +97,7 @@ class ImageBase(ObjectPluginBase):
 
         def get_readonly_fields(self, request, obj=None):
             readonly_fields = list(super().get_readonly_fields(request, obj))
-            if USE_ADMIN_THUMBNAIL:
+            if get_admin_thumbnail():
                 readonly_fields += ['admin_thumbnail']
             readonly_fields += ['get_is_public_display']
             return readonly_fields
@@ -79,7 +106,7 @@ class ImageBase(ObjectPluginBase):
 
 
 class DownloadBase(ObjectPluginBase):
-    download = models.ForeignKey(Download, on_delete=models.CASCADE,
+    download = models.ForeignKey(DOWNLOAD_MODEL, on_delete=models.CASCADE,
         verbose_name=_("download"))
 
     fk_fieldname = 'download'
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
@@ -6,21 +7,53 @@ from django.utils.translation import ugettext_lazy as _
 from shared.utils.text import slugify
 
 
+@lru_cache(maxsize=1024)
+def style_slug(style):
+    return slugify(style).replace("_", "-")
+
+
+@lru_cache(maxsize=1024)
+def styled_template_names(template_names, style):
+    """
+    Returns the template names with their _<style> variants,
+    see StyleMixin.add_styled_template_names.
+    """
+    extended_template_names = []
+    for template in template_names:
+        name, ext = os.path.splitext(template)
+        extended_template_names += [
+            "{name}/_{style}{ext}".format(
+                name=name, style=style, ext=ext),
+            template
+        ]
+    return tuple(extended_template_names)
+
+
 class StyleField(models.CharField):
     """
     Allows overriding of STYLE_CHOICES in subclasses.
+
+    Precomputes the style slugs of the choices for the model class.
     """
 
     def contribute_to_class(self, cls, name, **kwargs):
         if hasattr(cls, 'STYLE_CHOICES'):
             self.choices = cls.STYLE_CHOICES
         super().contribute_to_class(cls, name, **kwargs)
+        cls._style_slugs = {
+            style: style_slug(style)
+            for style in ['default'] + [value for value, label in self.flatchoices]
+            if style
+        }
 
 
 class StyleMixin(models.Model):
     STYLE_CHOICES = tuple()
     style = StyleField(_("style"), max_length=50, null=True, blank=True)
 
+    # See BasePlugin.render_fields
+    required_render_fields = ('style',)
+
     class Meta:
         abstract = True
 
@@ -40,7 +73,11 @@ class StyleMixin(models.Model):
 
     def get_style_slug(self):
         style = getattr(self, 'style', None) or 'default'
-        return slugify(style).replace("_", "-")
+        try:
+            return self._style_slugs[style]
+        except (AttributeError, KeyError):
+            # Free-form style
+            return style_slug(style)
 
     def add_styled_template_names(self, template_names):
         """
@@ -57,15 +94,7 @@ class StyleMixin(models.Model):
                 "_richtext.html",
             ]
         """
-        extended_template_names = []
-        for template in template_names:
-            name, ext = os.path.splitext(template)
-            extended_template_names += [
-                "{name}/_{style}{ext}".format(
-                    name=name, style=self.style, ext=ext),
-                template
-            ]
-        return extended_template_names
+        return list(styled_template_names(tuple(template_names), self.style))
 
     def get_template_names(self):
         if hasattr(super(), 'get_template_names'):
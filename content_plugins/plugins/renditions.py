@@ -0,0 +1,214 @@
+"""
+Background generation of image renditions (imagekit cache files).
+
+Renditions are the imagekit spec fields of an image, e.g. an
+ImageSpecField 'thumbnail' on the media archive's Image model.
+They are generated by a local thread pool after the plugin is saved.
+Rendering only uses renditions which already exist and queues missing
+ones (e.g. of images in use before, or whose file has been replaced).
+
+settings.py:
+
+CONTENT_PLUGINS_IMAGE_RENDITIONS = {
+    # spec field name: width for srcset
+    'thumbnail': 400,
+    'large': 1600,
+}
+CONTENT_PLUGINS_RENDITION_WORKERS = 2
+# sizes attribute of the img element
+CONTENT_PLUGINS_IMAGE_SIZES = '100vw'
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Names of the cache files queued in this process
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+@lru_cache()
+def get_cachefile_state():
+    """
+    Returns imagekit's CacheFileState or None if imagekit isn't installed.
+    """
+    try:
+        from imagekit.cachefiles.backends import CacheFileState
+    except ImportError:
+        return None
+    return CacheFileState
+
+
+def get_default_renditions():
+    return getattr(settings, 'CONTENT_PLUGINS_IMAGE_RENDITIONS', {})
+
+
+def get_default_sizes():
+    return getattr(settings, 'CONTENT_PLUGINS_IMAGE_SIZES', '100vw')
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CONTENT_PLUGINS_RENDITION_WORKERS', 2),
+                thread_name_prefix='content-plugins-renditions')
+        return _executor
+
+
+def generate_rendition(cachefile):
+    try:
+        cachefile.generate()
+    except Exception:
+        logger.exception("Generating rendition %r failed.", cachefile.name)
+    finally:
+        with _pending_lock:
+            _pending.discard(cachefile.name)
+        # Worker threads open their own database connections
+        connections.close_all()
+
+
+def queue_rendition(cachefile):
+    """
+    Generates the cache file in the background, unless it's already queued.
+    """
+    with _pending_lock:
+        if cachefile.name in _pending:
+            return
+        _pending.add(cachefile.name)
+    get_executor().submit(generate_rendition, cachefile)
+
+
+def queue_renditions(source, spec_names):
+    """
+    Generates the renditions in the background after the current
+    transaction has been committed.
+    """
+    spec_names = list(spec_names)
+    if get_cachefile_state() is None or source is None or not spec_names:
+        return
+
+    def _queue():
+        for name in spec_names:
+            cachefile = getattr(source, name, None)
+            if cachefile is not None:
+                queue_rendition(cachefile)
+
+    transaction.on_commit(_queue)
+
+
+def get_rendition_url(source, spec_name):
+    """
+    Returns the URL of the rendition or None if it hasn't been generated yet.
+    Never generates the rendition in the current thread, missing ones
+    are queued.
+    """
+    CacheFileState = get_cachefile_state()
+    if CacheFileState is None or source is None:
+        return None
+    cachefile = getattr(source, spec_name, None)
+    if cachefile is None:
+        return None
+    try:
+        state = cachefile.cachefile_backend.get_state(cachefile)
+        if state != CacheFileState.EXISTS:
+            if state != CacheFileState.GENERATING:
+                queue_rendition(cachefile)
+            return None
+        # Not cachefile.url, which would ask the cache file strategy
+        # to generate missing files
+        return cachefile.storage.url(cachefile.name)
+    except Exception:
+        logger.exception("Looking up rendition '%s' of %r failed.", spec_name, source)
+        return None
+
+
+def get_image_width(image):
+    """
+    Returns the width of the image field file or None. Uses the field's
+    width_field if set, otherwise the file has to be read.
+    """
+    if not image:
+        return None
+    width_field = getattr(image.field, 'width_field', None)
+    try:
+        if width_field:
+            return getattr(image.instance, width_field)
+        return image.width
+    except Exception:
+        logger.exception("Reading the width of %r failed.", image)
+        return None
+
+
+def get_srcset(source, renditions, original=None):
+    """
+    Returns a srcset attribute value of all generated renditions and
+    the original image field file.
+    """
+    srcset = []
+    for spec_name, width in renditions.items():
+        url = get_rendition_url(source, spec_name)
+        if url:
+            srcset.append("{} {}w".format(url, width))
+    width = get_image_width(original)
+    if width:
+        srcset.append("{} {}w".format(original.url, width))
+    return ", ".join(srcset)
+
+
+class RenditionMixin:
+    """
+    Queues the renditions of get_rendition_source() for generation when
+    the plugin is saved and provides a srcset of the generated renditions
+    and the original image, and the sizes for it.
+
+    Template:
+
+        <img src="{{ content.image.url }}"{% if content.srcset %} srcset="{{ content.srcset }}" sizes="{{ content.sizes }}"{% endif %}>
+    """
+
+    # {spec field name: width}, defaults to CONTENT_PLUGINS_IMAGE_RENDITIONS
+    renditions = None
+    # Image field of the rendition source holding the original
+    rendition_original_field = 'image'
+    # sizes attribute, defaults to CONTENT_PLUGINS_IMAGE_SIZES
+    rendition_sizes = None
+
+    def get_renditions(self):
+        if self.renditions is None:
+            return get_default_renditions()
+        return self.renditions
+
+    def get_rendition_source(self):
+        return self
+
+    def get_rendition_original(self):
+        return getattr(self.get_rendition_source(), self.rendition_original_field, None)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        queue_renditions(self.get_rendition_source(), self.get_renditions())
+
+    @property
+    def srcset(self):
+        return get_srcset(
+            self.get_rendition_source(), self.get_renditions(),
+            self.get_rendition_original())
+
+    @property
+    def sizes(self):
+        if self.rendition_sizes is None:
+            return get_default_sizes()
+        return self.rendition_sizes
@@ -1,16 +1,162 @@
-from django.db.models import Model
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import IntegerField, Model, Value
+from django.template import RequestContext
+from django.utils.functional import SimpleLazyObject
+from django.utils import translation
 from django.utils.translation import get_language
 
 from content_editor import renderer as content_editor
+from content_editor.contents import Contents
 from feincms3.renderer import Regions, TemplatePluginRenderer
 
+from .conditional import touch_item
+
 
 class MultilingualRegions(Regions):
     def cache_key(self, region):
         return '%s-%s' % (get_language(), super().cache_key(region))
 
 
+def _tree_depth_attr(ancestor):
+    if hasattr(ancestor, 'tree_depth'):
+        # feincms3 / django-tree-queries
+        return 'tree_depth'
+    mptt_meta = getattr(ancestor, '_mptt_meta', None)
+    if mptt_meta is not None:
+        return mptt_meta.level_attr
+    return None
+
+
+def _nearest_first(ancestors):
+    """
+    Returns ancestors ordered from the nearest to the farthest one.
+
+    If all ancestors have a tree depth (feincms3's tree_depth or the
+    level attribute of MPTT models), they are sorted by it, deepest first,
+    regardless of the order passed. Otherwise the given order is kept and
+    expected to be nearest first.
+    """
+    depth_attrs = set(_tree_depth_attr(a) for a in ancestors)
+    if len(depth_attrs) == 1 and None not in depth_attrs:
+        depth_attr = depth_attrs.pop()
+        return sorted(ancestors, key=lambda a: getattr(a, depth_attr), reverse=True)
+    return ancestors
+
+
+def plugins_with_contents(plugins, parent_ids):
+    """
+    Returns the plugins which have contents for any of parent_ids.
+
+    Uses a single UNION query over all plugin tables, so that the
+    contents only have to be loaded for the plugin types present.
+    """
+    plugins = list(plugins)
+    if len(plugins) <= 2:
+        # Not worth an additional query
+        return plugins
+    querysets = [
+        plugin._base_manager.filter(parent_id__in=parent_ids).order_by().annotate(
+            plugin_type=Value(index, output_field=IntegerField()),
+        ).values_list('plugin_type', flat=True)
+        for index, plugin in enumerate(plugins)
+    ]
+    present = set(querysets[0].union(*querysets[1:]))
+    return [plugin for index, plugin in enumerate(plugins) if index in present]
+
+
+def contents_for_item(item, plugins, inherit_from=None):
+    """
+    Like content_editor.contents.contents_for_item: loads the contents
+    of item and of all items in inherit_from with one query per plugin
+    model present (parent_id IN (...)), see plugins_with_contents.
+
+    Inherited regions are filled in memory with the contents of the
+    nearest ancestor which has contents for that region. Unlike
+    upstream, inherit_from is reordered by tree depth if available,
+    see _nearest_first, so page.ancestors() can be passed as is.
+
+    Plugins are loaded with their get_render_queryset(), if available,
+    so only their declared render_fields are fetched.
+    """
+    ancestors = _nearest_first([a for a in (inherit_from or []) if a.pk != item.pk])
+    items = {item.pk: item}
+    items.update((a.pk, a) for a in ancestors)
+    contents = {pk: Contents(i.regions) for pk, i in items.items()}
+
+    for plugin in plugins_with_contents(plugins, list(items)):
+        if hasattr(plugin, 'get_render_queryset'):
+            queryset = plugin.get_render_queryset()
+        else:
+            queryset = plugin.get_queryset()
+        queryset = queryset.filter(parent_id__in=list(items))
+        for obj in queryset:
+            # Avoid a query for every plugin's parent
+            obj.parent = items[obj.parent_id]
+            contents[obj.parent_id].add(obj)
+
+    item_contents = contents[item.pk]
+    for ancestor in ancestors:
+        item_contents.inherit_regions(contents[ancestor.pk])
+    return item_contents
+
+
 class ContentPluginRenderer(TemplatePluginRenderer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._plugins = None
+
+    def freeze(self):
+        """
+        Caches the plugins list (used by every regions() call) and
+        prevents further registrations, which raise ImproperlyConfigured.
+        The renderers stay a plain dict for feincms3's lookups, see
+        dispatch_table for a read-only view.
+
+        Call it once all plugins are registered, e.g. in your AppConfig:
+
+            def ready(self):
+                from .content_plugins import renderer
+                renderer.freeze()
+        """
+        if self._plugins is None:
+            self._plugins = tuple(self._renderers)
+
+    @property
+    def dispatch_table(self):
+        """
+        Read-only view of the registered renderers
+        {plugin_class: (template, context)}.
+        """
+        return MappingProxyType(self._renderers)
+
+    @property
+    def frozen(self):
+        return self._plugins is not None
+
+    def _check_not_frozen(self, plugin):
+        if self.frozen:
+            raise ImproperlyConfigured(
+                "Cannot register {} after the renderer has been frozen.".format(plugin))
+
+    def register_string_renderer(self, plugin, renderer):
+        self._check_not_frozen(plugin)
+        super().register_string_renderer(plugin, renderer)
+
+    def register_template_renderer(self, plugin, *args, **kwargs):
+        self._check_not_frozen(plugin)
+        super().register_template_renderer(plugin, *args, **kwargs)
+
+    def _get_plugins(self):
+        if self.frozen:
+            return self._plugins
+        return tuple(self._renderers)
+
+    def plugins(self):
+        return list(self._get_plugins())
+
     def register(self):
         """
         Used as decorator
@@ -27,7 +173,84 @@ class ContentPluginRenderer(TemplatePluginRenderer):
         return _renderer_wrapper
 
     def regions(self, item, inherit_from=None, regions=MultilingualRegions):
-        return super().regions(item, inherit_from=inherit_from, regions=regions)
+        """
+        Like TemplatePluginRenderer.regions, but loads the contents with
+        contents_for_item from this module (plugin types present only,
+        declared render fields, ancestors ordered nearest first).
+
+        Usage:
+            renderer.regions(page, inherit_from=page.ancestors())
+        """
+        return regions(
+            item=item,
+            contents=SimpleLazyObject(
+                lambda: contents_for_item(item, self._get_plugins(), inherit_from)
+            ),
+            renderer=self,
+        )
+
+    def render_languages(self, item, languages, inherit_from=None, context=None,
+            timeout=None, regions=MultilingualRegions, request=None):
+        """
+        Loads the contents of item once and renders all its regions
+        for every language in languages.
+
+        If request is given, every language is rendered with a
+        RequestContext (context processors, request.LANGUAGE_CODE set to
+        the language) instead of context.
+
+        Returns a dict {language: {region_key: html}}. If timeout is given,
+        the results are stored in the cache under the regions' cache keys
+        (respectively existing cache entries are returned).
+
+        Usage:
+            renderer.render_languages(page, ['de', 'en'], timeout=3600)
+        """
+        # Lazy, so that nothing is loaded if all regions are cached
+        contents = SimpleLazyObject(
+            lambda: contents_for_item(item, self._get_plugins(), inherit_from))
+        rendered = {}
+        for language in languages:
+            with translation.override(language):
+                if request is not None:
+                    request.LANGUAGE_CODE = language
+                    context = RequestContext(request)
+                language_regions = regions(item=item, contents=contents, renderer=self)
+                rendered[language] = {
+                    region.key: language_regions.render(region.key, context, timeout=timeout)
+                    for region in item.regions
+                }
+        return rendered
+
+    def clone_contents(self, item, target, exclude=[]):
+        """
+        Copies all plugins of item to target, keeping region and ordering.
+
+        Uses one query and one bulk_create per plugin model present. Rows are copied
+        column by column, so richtext isn't cleansed again and foreign keys
+        (e.g. of ObjectPluginBase) are copied without fetching their targets.
+        save() isn't called and no signals are sent.
+
+        Returns a dict {plugin_class: [cloned instances]}.
+
+        Usage:
+            renderer.clone_contents(page, page_copy)
+        """
+        clones = {}
+        with transaction.atomic():
+            plugins = [p for p in self._get_plugins() if p not in exclude]
+            for plugin in plugins_with_contents(plugins, [item.pk]):
+                attnames = [
+                    f.attname for f in plugin._meta.concrete_fields
+                    if not f.primary_key and f.attname != 'parent_id'
+                ]
+                rows = plugin._base_manager.filter(parent_id=item.pk).values(*attnames)
+                objs = [plugin(parent_id=target.pk, **row) for row in rows]
+                if objs:
+                    clones[plugin] = plugin._base_manager.bulk_create(objs)
+        # bulk_create doesn't send post_save
+        touch_item(target.__class__, target.pk)
+        return clones
 
     def admin_inlines(self, exclude=[]):
         """
@@ -42,15 +265,65 @@ class ContentPluginRenderer(TemplatePluginRenderer):
 
 # Experimental implementation
 class PluginRenderer(content_editor.PluginRenderer):
+    def __init__(self):
+        super().__init__()
+        self._dispatch = None
+        self._plugins = None
+        # Renderers of unregistered subclasses, resolved through the MRO
+        self._resolved = {}
+
     def register(self, plugin, renderer=None):
+        if self._dispatch is not None:
+            raise ImproperlyConfigured(
+                "Cannot register {} after the renderer has been frozen.".format(plugin))
         if not renderer:
             # Might raise an AttributeError
             renderer = getattr(plugin, 'render')
         self._renderers[plugin] = renderer
+        self._resolved.clear()
+
+    def freeze(self):
+        """
+        Compiles the registered renderers into a dispatch table
+        {plugin_class: renderer}, see render_content. Registering
+        plugins afterwards raises ImproperlyConfigured.
+
+        Call it once all plugins are registered, e.g. in AppConfig.ready().
+        """
+        if self._dispatch is None:
+            self._dispatch = dict(self._renderers)
+            self._plugins = tuple(p for p in self._renderers if p is not Model)
+
+    @property
+    def dispatch_table(self):
+        if self._dispatch is None:
+            return None
+        return MappingProxyType(self._dispatch)
+
+    def _resolve(self, plugin_class):
+        try:
+            return self._resolved[plugin_class]
+        except KeyError:
+            pass
+        for cls in plugin_class.__mro__:
+            if cls in self._renderers:
+                renderer = self._resolved[plugin_class] = self._renderers[cls]
+                return renderer
+        raise KeyError(plugin_class)
+
+    def render_content(self, content, **kwargs):
+        try:
+            # Fast path: exact type lookup in the frozen dispatch table
+            renderer = self._dispatch[content.__class__]
+        except (KeyError, TypeError):
+            renderer = self._resolve(content.__class__)
+        return renderer(content, **kwargs)
 
     def get_registered_plugins(self, exclude=[]):
-        registered_plugins = list(self._renderers.keys())
-        registered_plugins.remove(Model)
+        if self._plugins is not None:
+            registered_plugins = self._plugins
+        else:
+            registered_plugins = [p for p in self._renderers if p is not Model]
         return [p for p in registered_plugins if p not in exclude]
 
     def get_admin_inlines(self, exclude=[]):
@@ -57,6 +57,7 @@ setup(
         exclude=['tests', 'testapp'],
     ),
     include_package_data=True,
+    python_requires='>=3.7',
     install_requires=[
         # 'django<2', commented out to make `pip install -U` easier
         'django-content-editor',